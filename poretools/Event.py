@@ -1,76 +1,75 @@
-class Event(object):
+from collections import namedtuple
+
+import numpy as np
+
+EVENT_FIELDS = ('mean', 'start', 'stdv', 'length', 'model_state',
+                'model_level', 'move', 'p_model_state', 'mp_state',
+                'p_mp_state', 'p_A', 'p_C', 'p_G', 'p_T')
+
+# column types of the EVENT_FIELDS in basecalled Events tables
+EVENT_DTYPE = np.dtype([('mean', '<f8'), ('start', '<f8'), ('stdv', '<f8'),
+                        ('length', '<f8'), ('model_state', 'S6'),
+                        ('model_level', '<f8'), ('move', '<i8'),
+                        ('p_model_state', '<f4'), ('mp_state', 'S6'),
+                        ('p_mp_state', '<f4'), ('p_A', '<f4'), ('p_C', '<f4'),
+                        ('p_G', '<f4'), ('p_T', '<f4')])
+
+
+class Event(namedtuple('Event', EVENT_FIELDS)):
     """
-	Very basic class to represent a nanopore 
+	Very basic class to represent a nanopore
 	translocation event for a single pore
-	based upon data in the Events table of 
-	a Oxford Nanopore FAST5 (HDF5) file
+	based upon data in the Events table of
+	a Oxford Nanopore FAST5 (HDF5) file.
+
+	Fields missing from the Events table are set to "".
 	"""
+    __slots__ = ()
 
-    def __init__(self, row):
-        self.row = row
-        try:
-            self.mean = row['mean']
-        except Exception:
-            self.mean = ""
-        try:
-            self.start = row['start']
-        except Exception:
-            self.start = ""
-        try:
-            self.stdv = row['stdv']
-        except Exception:
-            self.stdv = ""
-        try:
-            self.length = row['length']
-        except Exception:
-            self.length = ""
-        try:
-            self.model_state = row['model_state']
-        except Exception:
-            self.model_state = ""
-        try:
-            self.model_level = row['model_level']
-        except Exception:
-            self.model_level = ""
-        try:
-            self.move = row['move']
-        except Exception:
-            self.move = ""
-        try:
-            self.p_model_state = row['p_model_state']
-        except Exception:
-            self.p_model_state = ""
-        try:
-            self.mp_state = row['mp_state']
-        except Exception:
-            self.mp_state = ""
-        try:
-            self.p_mp_state = row['p_mp_state']
-        except Exception:
-            self.p_mp_state = ""
-        try:
-            self.p_A = row['p_A']
-        except Exception:
-            self.p_A = ""
-        try:
-            self.p_C = row['p_C']
-        except Exception:
-            self.p_C = ""
-        try:
-            self.p_G = row['p_G']
-        except Exception:
-            self.p_G = ""
-        try:
-            self.p_T = row['p_T']
-        except Exception:
-            self.p_T = ""
+    @classmethod
+    def from_row(cls, row):
+        """
+		Build an Event from one row of a structured Events array.
+		"""
+        names = row.dtype.names or ()
+        return cls._make(row[field] if field in names else ""
+                         for field in EVENT_FIELDS)
 
     def __repr__(self):
-        return '\t'.join([
-            str(s) for s in [
-                self.mean, self.start, self.stdv, self.length,
-                self.model_state, self.model_level, self.move,
-                self.p_model_state, self.mp_state, self.p_mp_state, self.p_A,
-                self.p_C, self.p_G, self.p_T
-            ]
-        ])
+        return '\t'.join([str(s) for s in self])
+
+
+class EventArray(object):
+    """
+	Sequence of events backed by the structured NumPy array read
+	from an Events table. Event objects are only built when the
+	array is iterated or indexed; columnar code can use the
+	underlying array directly, e.g. events.arr['mean'].
+	"""
+
+    def __init__(self, arr):
+        self.arr = arr
+
+    @classmethod
+    def empty(cls):
+        """
+		Return an EventArray with no events but the usual columns,
+		for reads that lack an Events table.
+		"""
+        return cls(np.empty(0, dtype=EVENT_DTYPE))
+
+    def __len__(self):
+        return len(self.arr)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return EventArray(self.arr[i])
+        return Event.from_row(self.arr[i])
+
+    def __iter__(self):
+        n = len(self.arr)
+        names = self.arr.dtype.names or ()
+        columns = [self.arr[field] if field in names else [""] * n
+                   for field in EVENT_FIELDS]
+        for values in zip(*columns):
+            yield Event._make(values)
@@ -1,12 +1,24 @@
 import sys
 import os
+import io
 import glob
+import itertools
 import tarfile
 import shutil
 import h5py
-import dateutil.parser
+from h5py import h5d, h5s
+import numpy as np
 import datetime
-import time
+from functools import cached_property
+from dataclasses import dataclass
+from typing import Optional
+import multiprocessing
+from collections import deque
+
+try:
+    import libarchive
+except ImportError:
+    libarchive = None
 
 #logging
 import logging
@@ -20,7 +32,7 @@ logger = logging.getLogger('poretools')
 
 # poretools imports
 from . import formats
-from .Event import Event
+from .Event import EventArray
 
 fastq_paths = {
     'closed': {},
@@ -44,11 +56,27 @@ fastq_paths = {
     }
 }
 
+# basecaller analysis groups used to guess the layout, most likely first
+BASECALL_VERSIONS = (
+    ('classic', 'Basecall_2D_%03d'),
+    ('metrichor1.16', 'Basecall_1D_%03d'),
+    ('r9rnn', 'Basecall_RNN_1D_%03d'),
+)
+
 FAST5SET_FILELIST = 0
 FAST5SET_DIRECTORY = 1
 FAST5SET_SINGLEFILE = 2
 FAST5SET_TARBALL = 3
 PORETOOLS_TMPDIR = '.poretools_tmp'
+TARBALL_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+# buffer size used when copying FAST5 files out of compressed tarballs
+TARBALL_COPY_BUFSIZE = 1 << 20
+
+# groups under /UniqueGlobalKey holding per-read metadata attributes
+METADATA_GROUPS = ('tracking_id', 'context_tags', 'channel_id', 'read_id')
+
+# number of upcoming files Fast5FileSet prefetches into the page cache
+READAHEAD_FILES = 2
 
 
 class Fast5DirHandler(object):
@@ -57,13 +85,12 @@ class Fast5DirHandler(object):
 
     def __init__(self, dir):
         self.dir = dir
-        self.files = []
+        self.files = deque()
         super(Fast5DirHandler, self).__init__()
 
         if os.path.isdir(self.dir):
             pattern = self.dir + os.path.sep + '*.fast5'
-            files = glob.glob(pattern)
-            self.files = files
+            self.files = deque(glob.glob(pattern))
 
     def process(self, event):
         self.files.append(event.src_path)
@@ -72,14 +99,14 @@ class Fast5DirHandler(object):
         self.process(event)
 
     def clear(self):
-        self.files = []
+        self.files = deque()
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        if len(self.files) > 0:
-            return self.files.pop(0)
+        if self.files:
+            return self.files.popleft()
         else:
             raise StopIteration()
 
@@ -94,28 +121,87 @@ class Fast5FileSet(object):
         self.set_type = None
         self.num_files_in_set = None
         self.group = group
+        # upcoming files whose readahead has already been requested
+        self._lookahead = deque()
         self._extract_fast5_files()
 
     def get_num_files(self):
         """
-		Return the number of files in the FAST5 set.
+		Return the number of files in the FAST5 set, or None if it is
+		not known up front (directories and tarballs are read lazily;
+		see count()).
 		"""
-        if self.num_files_in_set is None and self.set_type == FAST5SET_TARBALL:
-            self.num_files_in_set = len(self.files)
+        return self.num_files_in_set
+
+    def count(self):
+        """
+		Count the FAST5 files in the set without keeping their paths.
+		For directories and tarballs this is a separate pass over the
+		input, so only call it when the total is really needed.
+		"""
+        if self.num_files_in_set is None:
+            f = self.fileset[0]
+            if self.set_type == FAST5SET_DIRECTORY:
+                self.num_files_in_set = sum(1 for _ in _scan_fast5(f))
+            elif self.set_type == FAST5SET_TARBALL:
+                with tarfile.open(f, 'r|*') as tar:
+                    self.num_files_in_set = sum(
+                        1 for tarinfo in tar if tarinfo.isfile() and
+                        TarballFileIterator._fast5_filename_filter(
+                            tarinfo.name))
         return self.num_files_in_set
 
     def __iter__(self):
         return self
 
+    def imap(self, func, processes=None, chunksize=64, maxtasksperchild=1000):
+        """
+		Apply func to every FAST5 file in the set using a pool of worker
+		processes, yielding the results in completion order.
+
+		func must be a picklable (module-level) callable that takes a
+		Fast5File and returns plain picklable data, e.g. a string or a
+		tuple of the fields of interest.
+		"""
+        pool = multiprocessing.Pool(processes,
+                                    initializer=_init_imap_worker,
+                                    initargs=(func, self.group),
+                                    maxtasksperchild=maxtasksperchild)
+        try:
+            files = itertools.chain(self._lookahead, self.files)
+            for result in pool.imap_unordered(_imap_worker, files, chunksize):
+                yield result
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+            if self.set_type == FAST5SET_TARBALL and \
+               os.path.isdir(PORETOOLS_TMPDIR):
+                shutil.rmtree(PORETOOLS_TMPDIR)
+
     def __next__(self):
         try:
-            return Fast5File(next(self.files), self.group)
+            self._prefetch()
+            return Fast5File(self._lookahead.popleft(), self.group)
         except Exception as e:
             # cleanup our mess
             if self.set_type == FAST5SET_TARBALL:
                 shutil.rmtree(PORETOOLS_TMPDIR)
             raise StopIteration
 
+    def _prefetch(self):
+        """
+		Ask the kernel to start reading the next few files while the
+		current one is being parsed.
+		"""
+        while len(self._lookahead) <= READAHEAD_FILES:
+            try:
+                filename = next(self.files)
+            except StopIteration:
+                break
+            _readahead(filename)
+            self._lookahead.append(filename)
+
     def _extract_fast5_files(self):
 
         # return as-is if list of files
@@ -130,19 +216,21 @@ class Fast5FileSet(object):
             if os.path.isdir(f):
                 # Update (2/3/17) to account for new sub-directory
                 # output from MinKNOW v1.4 release.
-                files = [os.path.join(dirpath + os.path.sep + fast5file) \
-                    for dirpath, dirname, files in os.walk(f) \
-                     for fast5file in files]
-                #pattern = f + '/' + '*.fast5'
-                #files = glob.glob(pattern)
-                self.files = iter(files)
-                self.num_files_in_set = len(files)
-                self.set_type = FAST5SET_DIRECTORY
-                if not len(files):
+                files = _scan_fast5(f)
+                first = next(files, None)
+                if first is None:
                     logger.warning("Directory is empty!")
+                    self.files = iter([])
+                else:
+                    self.files = itertools.chain([first], files)
+                # counting would mean walking the whole tree up front
+                self.num_files_in_set = None
+                self.set_type = FAST5SET_DIRECTORY
 
-            # is it a tarball?
-            elif tarfile.is_tarfile(f):
+            # is it a tarball? trust the usual extensions and only sniff
+            # the headers of files whose name does not tell us.
+            elif f.endswith(TARBALL_EXTENSIONS) or \
+                 (not f.endswith('.fast5') and tarfile.is_tarfile(f)):
                 if os.path.isdir(PORETOOLS_TMPDIR):
                     shutil.rmtree(PORETOOLS_TMPDIR)
                 os.mkdir(PORETOOLS_TMPDIR)
@@ -162,35 +250,167 @@ class Fast5FileSet(object):
             sys.exit()
 
 
+# per-process state for Fast5FileSet.imap workers
+_imap_func = None
+_imap_group = 0
+
+
+def _init_imap_worker(func, group):
+    global _imap_func, _imap_group
+    _imap_func = func
+    _imap_group = group
+
+
+def _imap_worker(filename):
+    with Fast5File(filename, _imap_group) as fast5:
+        return _imap_func(fast5)
+
+
 class TarballFileIterator:
 
-    def _fast5_filename_filter(self, filename):
+    @staticmethod
+    def _fast5_filename_filter(filename):
         return os.path.basename(filename).endswith(
             '.fast5') and not os.path.basename(filename).startswith('.')
 
+    @staticmethod
+    def _member_path(name):
+        """
+		Return the path below PORETOOLS_TMPDIR that the member name is
+		extracted to, or None (with a warning) if it would land outside
+		of it, e.g. an absolute name or one with '..' components.
+		"""
+        path = os.path.normpath(os.path.join(PORETOOLS_TMPDIR, name))
+        root = os.path.realpath(PORETOOLS_TMPDIR)
+        if os.path.commonpath([root, os.path.realpath(path)]) != root:
+            logger.warning("Skipping tarball member outside of %s: %s"
+                           % (PORETOOLS_TMPDIR, name))
+            return None
+        return path
+
     def __init__(self, tarball):
         self._tarball = tarball
-        self._tarfile = tarfile.open(tarball)
+        self._tarfile = None
+        if libarchive is not None:
+            self._members = self._libarchive_members()
+        else:
+            self._tarfile = tarfile.open(tarball)
+            self._members = self._tarfile_members()
 
     def __del__(self):
-        self._tarfile.close()
+        if getattr(self, '_members', None) is not None:
+            self._members.close()
+        if getattr(self, '_tarfile', None) is not None:
+            self._tarfile.close()
 
     def __iter__(self):
         return self
 
     def __next__(self):
+        return next(self._members)
+
+    def _libarchive_members(self):
+        """
+		Extract the FAST5 members one at a time with libarchive, which
+		parses the archive headers (and any compression) in C.
+		"""
+        with libarchive.file_reader(self._tarball) as archive:
+            for entry in archive:
+                if not entry.isfile or \
+                   not self._fast5_filename_filter(entry.pathname):
+                    continue
+                path = self._member_path(entry.pathname)
+                if path is None:
+                    continue
+                dirname = os.path.dirname(path)
+                if dirname:
+                    os.makedirs(dirname, exist_ok=True)
+                with open(path, 'wb') as dst:
+                    for block in entry.get_blocks(TARBALL_COPY_BUFSIZE):
+                        dst.write(block)
+                yield path
+
+    def _tarfile_members(self):
         while True:
-            tarinfo = next(self._tarfile)
+            tarinfo = self._tarfile.next()
             if tarinfo is None:
-                raise StopIteration
-            elif self._fast5_filename_filter(tarinfo.name):
-                break
-        self._tarfile.extract(tarinfo, path=PORETOOLS_TMPDIR)
-        return os.path.join(PORETOOLS_TMPDIR, tarinfo.name)
+                return
+            if not self._fast5_filename_filter(tarinfo.name):
+                continue
+            path = self._member_path(tarinfo.name)
+            if path is None:
+                continue
+            if tarinfo.isfile() and not tarinfo.issparse():
+                self._extract_file(tarinfo, path)
+            else:
+                try:
+                    self._tarfile.extract(tarinfo, path=PORETOOLS_TMPDIR,
+                                          filter='data')
+                except tarfile.TarError as e:
+                    logger.warning("Skipping tarball member %s: %s"
+                                   % (tarinfo.name, e))
+                    continue
+            yield path
 
-    def __len__(self):
-        with tarfile.open(self._tarball) as tar:
-            return len(tar.getnames())
+    def _extract_file(self, tarinfo, path):
+        """
+		Write a regular tarball member to path. Uncompressed tarballs
+		are copied in-kernel with sendfile(); otherwise the member is
+		streamed through a large buffer rather than tarfile's 16 KiB one.
+		"""
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        with os.fdopen(fd, 'wb') as dst:
+            fileobj = self._tarfile.fileobj
+            if sys.platform.startswith('linux') and \
+               isinstance(fileobj, io.BufferedReader):
+                try:
+                    self._sendfile(fileobj.fileno(), fd, tarinfo)
+                    return
+                except OSError:
+                    dst.seek(0)
+                    dst.truncate()
+            src = self._tarfile.extractfile(tarinfo)
+            shutil.copyfileobj(src, dst, TARBALL_COPY_BUFSIZE)
+
+    def _sendfile(self, infd, outfd, tarinfo):
+        offset = tarinfo.offset_data
+        remaining = tarinfo.size
+        while remaining > 0:
+            sent = os.sendfile(outfd, infd, offset, remaining)
+            if sent == 0:
+                raise OSError("unexpected end of tarball %s" % self._tarball)
+            offset += sent
+            remaining -= sent
+
+
+@dataclass
+class Fast5Summary:
+    """
+	Flowcell metadata and timing for a single read, as returned by
+	Fast5File.summary(). Values missing from the file are None.
+	"""
+    filename: str
+    channel: Optional[int]
+    exp_start_time: Optional[int]
+    start_time: Optional[int]
+    duration: Optional[float]
+    end_time: Optional[float]
+    sample_frequency: Optional[int]
+    run_id: Optional[str]
+    flowcell_id: Optional[str]
+    asic_id: Optional[str]
+    asic_temp: Optional[str]
+    heatsink_temp: Optional[str]
+    device_id: Optional[str]
+    host_name: Optional[str]
+    run_purpose: Optional[str]
+    script_name: Optional[str]
+    sample_name: Optional[str]
+    version_name: Optional[str]
+    minknow_version: Optional[str]
 
 
 class Fast5File(object):
@@ -203,12 +423,17 @@ class Fast5File(object):
             self.version = self.guess_version()
         else:
             self.version = 'closed'
+        # resolve the HDF5 paths for this version and group once
+        self._paths = dict((id, h5path.format(self.group))
+                           for id, h5path in fastq_paths[self.version].items())
 
         self.fastas = {}
         self.fastqs = {}
+        # decoded FASTQ text per sequence type, shared by fastqs and fastas
+        self._raw_fastq = {}
 
         # pre-load the FASTQ data
-        #self._extract_fastqs_from_fast5()
+        #self._extract_sequences(want_fasta=False)
 
         # booleans for lazy loading (speed)
         self.have_fastqs = False
@@ -221,6 +446,12 @@ class Fast5File(object):
     def __del__(self):
         self.close()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     ####################################################################
     # Public API methods
     ####################################################################
@@ -243,26 +474,15 @@ class Fast5File(object):
 		Try and guess the location of template/complement blocks
 		"""
         try:
-            self.hdf5file["/Analyses/Basecall_2D_%03d/BaseCalled_template" %
-                          (self.group)]
-            return 'classic'
-        except KeyError:
-            pass
-
-        try:
-            self.hdf5file["/Analyses/Basecall_1D_%03d/BaseCalled_template" %
-                          (self.group)]
-            return 'metrichor1.16'
+            analyses = self.hdf5file['/Analyses']
         except KeyError:
-            pass
+            return 'prebasecalled'
 
-        # less likely
-        try:
-            self.hdf5file["/Analyses/Basecall_RNN_1D_%03d/BaseCalled_template"
-                          % (self.group)]
-            return 'r9rnn'
-        except KeyError:
-            pass
+        names = set(analyses.keys())
+        for version, basecall in BASECALL_VERSIONS:
+            basecall = basecall % (self.group)
+            if basecall in names and 'BaseCalled_template' in analyses[basecall]:
+                return version
 
         return 'prebasecalled'
 
@@ -270,8 +490,12 @@ class Fast5File(object):
         """
 		Close an open an ONT Fast5 file, assuming HDF5 format
 		"""
-        if self.is_open:
-            self.hdf5file.close()
+        # is_open is unset if __init__ failed before open() returned
+        if getattr(self, 'is_open', False):
+            try:
+                self.hdf5file.close()
+            except Exception:
+                pass
             self.is_open = False
 
     def has_2D(self):
@@ -280,7 +504,7 @@ class Fast5File(object):
 		Return FALSE otherwise.
 		"""
         if self.have_fastas is False:
-            self._extract_fastas_from_fast5()
+            self._extract_sequences(want_fastq=False)
             self.have_fastas = True
 
         if self.fastas.get('twodirections') is not None:
@@ -293,7 +517,7 @@ class Fast5File(object):
 		in FASTQ format.
 		"""
         if self.have_fastqs is False:
-            self._extract_fastqs_from_fast5()
+            self._extract_sequences(want_fasta=False)
             self.have_fastqs = True
 
         fqs = []
@@ -320,7 +544,7 @@ class Fast5File(object):
 		in FASTQ format.
 		"""
         if self.have_fastas is False:
-            self._extract_fastas_from_fast5()
+            self._extract_sequences(want_fastq=False)
             self.have_fastas = True
 
         fas = []
@@ -338,7 +562,7 @@ class Fast5File(object):
             fas.append(self.fastas.get('complement'))
         elif choice == "best":
             if self.have_fastqs is False:
-                self._extract_fastqs_from_fast5()
+                self._extract_sequences(want_fasta=False)
                 self.have_fastqs = True
             fas.append(self.fastas.get(self.get_best_type()))
 
@@ -350,7 +574,7 @@ class Fast5File(object):
                 in FASTQ format.
                 """
         if self.have_fastas is False:
-            self._extract_fastas_from_fast5()
+            self._extract_sequences(want_fastq=False)
             self.have_fastas = True
 
         return self.fastas
@@ -362,7 +586,7 @@ class Fast5File(object):
 		If all fail, return None
 		"""
         if self.have_fastqs is False:
-            self._extract_fastqs_from_fast5()
+            self._extract_sequences(want_fasta=False)
             self.have_fastqs = True
 
         if not self.fastqs:
@@ -380,6 +604,10 @@ class Fast5File(object):
 		in FASTA format. Try 2D then template, then complement.
 		If all fail, return None
 		"""
+        if self.have_fastas is False:
+            self._extract_sequences(want_fastq=False)
+            self.have_fastas = True
+
         if not self.fastas:
             return None
         elif self.fastas.get('twodirections') is not None:
@@ -423,48 +651,28 @@ class Fast5File(object):
     # Flowcell Metadata methods
     ####################################################################
 
+    def summary(self):
+        """
+		Return a Fast5Summary with the flowcell metadata and timing
+		of this read. It is built once, from a single snapshot of the
+		metadata attributes and the cached read/timing nodes. The
+		metadata get_* accessors below never look up the timing nodes.
+		"""
+        return self._summary
+
     def get_exp_start_time(self):
         """
 		Return the starting time at which signals were collected
 		for the given read.
 		"""
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            if self.keyinfo['tracking_id'].attrs['exp_start_time'].endswith(
-                    'Z'):
-                # MinKNOW >= 1.4 ISO format and UTC time
-                dt = dateutil.parser.parse(
-                    self.keyinfo['tracking_id'].attrs['exp_start_time'])
-                timestamp = int(time.mktime(dt.timetuple()))
-            else:
-                # Unix time stamp from MinKNOW < 1.4
-                timestamp = int(
-                    self.keyinfo['tracking_id'].attrs['exp_start_time'])
-            return timestamp
-        except KeyError as e:
-            return None
+        return self._metadata['exp_start_time']
 
     def get_channel_number(self):
         """
 		Return the channel (pore) number at which signals were collected
 		for the given read.
 		"""
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return int(self.keyinfo['channel_id'].attrs['channel_number'])
-        except:
-            pass
-
-        try:
-            return int(self.keyinfo['read_id'].attrs['channel_number'])
-        except:
-            return None
+        return self._metadata['channel']
 
     def find_read_number_block_link(self):
         """
@@ -508,23 +716,32 @@ Please report this error (with the offending file) to:
 
 		Return the Read's node if found, or None if not found.
 		"""
+        node, error = self._find_raw_read()
+        if error is not None:
+            self.hdf_internal_error(error)
+        return node
+
+    def _find_raw_read(self):
+        """
+		Look up the single 'Raw/Reads/read_NNN' node without exiting.
+		Return a (node, error) tuple, where error describes an
+		unexpected Raw/Reads layout and is None otherwise.
+		"""
         raw_reads = self.hdf5file.get('Raw/Reads')
         if raw_reads is None:
-            return None
+            return None, None
 
         reads = list(raw_reads.keys())
         if len(reads) == 0:
-            self.hdf_internal_error(
-                "Raw/Reads group does not contain any items")
+            return None, "Raw/Reads group does not contain any items"
         if len(reads) > 1:
             # This should not happen, based on information from ONT developers.
-            self.hdf_internal_error(
-                "Raw/Reads group contains more than one item")
+            return None, "Raw/Reads group contains more than one item"
         path = 'Raw/Reads/%s' % (reads[0])
         node = self.hdf5file.get(path)
         if node is None:
-            self.hdf_internal_error("Failed to get HDF5 item '%s'" % (path))
-        return node
+            return None, "Failed to get HDF5 item '%s'" % (path)
+        return node, None
 
     def find_read_number_block(self):
         """Returns the node of the 'Read_NNN' information, or None if not
@@ -542,20 +759,38 @@ Please report this error (with the offending file) to:
             "unknown HDF5 structure: can't find read block item")
 
     def find_event_timing_block(self):
-        path = fastq_paths[self.version]['template'] % (self.group)
         try:
-            node = self.hdf5file[path]
+            node = self.hdf5file[self._paths['template']]
             path = node.get('Events')
             #, getlink=True)
             return path
         except Exception:
             return None
 
+    @cached_property
+    def _read_number_node(self):
+        return self.find_read_number_block()
+
+    @cached_property
+    def _raw_read_node(self):
+        # only used for timing: an odd Raw/Reads layout leaves the
+        # timing unknown instead of aborting the whole run
+        if not self.is_open:
+            return None
+        node, error = self._find_raw_read()
+        if error is not None:
+            logger.warning("%s: %s" % (self.filename, error))
+        return node
+
+    @cached_property
+    def _event_timing_node(self):
+        return self.find_event_timing_block()
+
     def get_read_number(self):
         """
 		Return the read number for the pore representing the given read.
 		"""
-        node = self.find_read_number_block()
+        node = self._read_number_node
         if node:
             try:
                 return int(node.attrs['read_number'])
@@ -567,7 +802,7 @@ Please report this error (with the offending file) to:
         """
 		Return the mux (multiplexer) setting for this read: identify the pore with this and get_channel_number()
 		"""
-        node = self.find_read_number_block()
+        node = self._read_number_node
         if node:
             try:
                 return int(node.attrs['start_mux'])
@@ -577,271 +812,112 @@ Please report this error (with the offending file) to:
 
     def get_duration(self):
         # poretools returns in seconds not samples
-
-        node = self.find_read_number_block_fixed_raw()
-        if node:
-            try:
-                return int(
-                    node.attrs['duration']) / self.get_sample_frequency()
-            except Exception as e:
-                logger.error(str(e))
-                pass
-
-        node = self.find_event_timing_block()
-        if node:
-            #NOTE: 'duration' in the HDF is a float-point number,
-            #      and can be less than one - which will return 0.
-            #TODO: consider supporing floating-point, or at least
-            #      rounding values instead of truncating to int.
-            return int(node.attrs['duration'])
-        return None
+        return self._timing['duration']
 
     def get_start_time(self):
         # poretools returns a unix timestamp not samples
-
-        exp_start_time = self.get_exp_start_time()
-
-        # new raw files
-        node = self.find_read_number_block_fixed_raw()
-        if node:
-            try:
-                frequency = int(self.get_sample_frequency())
-                return int(exp_start_time) + int(
-                    node.attrs['start_time'] / frequency)
-            except Exception as e:
-                logger.error(str(e))
-                pass
-
-        node = self.find_event_timing_block()
-        if node:
-            return int(exp_start_time) + int(node.attrs['start_time'])
-
-        return None
+        return self._timing['start_time']
 
     def get_end_time(self):
-        exp_start_time = self.get_exp_start_time()
-        start_time = self.get_start_time()
-        duration = self.get_duration()
-
-        # 'duration' can be zero and still valid
-        # (if the duration of the template was less than 1 second).
-        # Check for None instead of False.
-        if start_time and (duration is not None):
-            return start_time + duration
-        else:
-            return None
+        return self._timing['end_time']
 
     def get_version_name(self):
         """
 		Return the flow cell version name.
 		"""
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['context_tags'].attrs['version_name']
-        except:
-            return None
+        return self._metadata['version_name']
 
     def get_minknow_version(self):
         """
 		Return the flow cell version name.
 		"""
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['context_tags'].attrs['verssion']
-        except:
-            return None
+        return self._metadata['minknow_version']
 
     def get_run_id(self):
         """
 		Return the run id.
 		"""
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['tracking_id'].attrs['run_id']
-        except:
-            return None
+        return self._metadata['run_id']
 
     def get_heatsink_temp(self):
         """
 		Return the heatsink temperature.
 		"""
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['tracking_id'].attrs['heatsink_temp']
-        except:
-            return None
+        return self._metadata['heatsink_temp']
 
     def get_asic_temp(self):
         """
 		Return the ASIC temperature.
 		"""
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['tracking_id'].attrs['asic_temp']
-        except:
-            return None
+        return self._metadata['asic_temp']
 
     def get_flowcell_id(self):
         """
 		Return the flowcell_id.
 		"""
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['tracking_id'].attrs['flowcell_id']
-        except:
-            pass
-
-        try:
-            return self.keyinfo['tracking_id'].attrs['flow_cell_id']
-        except:
-            return None
-
-    def get_host_name(self):
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['tracking_id'].attrs['hostname']
-        except:
-            return None
+        return self._metadata['flowcell_id']
 
     def get_run_purpose(self):
         """
 		Return the exp_script_purpose.
 		"""
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['tracking_id'].attrs['exp_script_purpose']
-        except:
-            return None
+        return self._metadata['run_purpose']
 
     def get_asic_id(self):
         """
 		Return the flowcell's ASIC id.
 		"""
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['tracking_id'].attrs['asic_id']
-        except:
-            return None
-
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
+        return self._metadata['asic_id']
 
     def get_host_name(self):
         """
                 Return the MinKNOW host computer name.
                 """
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['tracking_id'].attrs['hostname']
-        except:
-            return None
-
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
+        return self._metadata['host_name']
 
     def get_device_id(self):
         """
 		Return the flowcell's device id.
 		"""
-
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['tracking_id'].attrs['device_id']
-        except:
-            return None
+        return self._metadata['device_id']
 
     def get_sample_name(self):
         """
 		Return the user supplied sample name
 		"""
-
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return self.keyinfo['context_tags'].attrs['user_filename_input']
-        except Exception as e:
-            return None
+        return self._metadata['sample_name']
 
     def get_sample_frequency(self):
         """
 		Return the user supplied sample name
 		"""
-
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metadata = True
-
-        try:
-            return int(self.keyinfo['context_tags'].attrs['sample_frequency'])
-        except Exception as e:
-            return None
+        return self._metadata['sample_frequency']
 
     def get_script_name(self):
-        if self.have_metadata is False:
-            self._get_metadata()
-            self.have_metdata = True
-        try:
-            return self.keyinfo['tracking_id'].attrs['exp_script_name']
-        except Exception as e:
-            return None
+        return self._metadata['script_name']
 
     def get_template_events_count(self):
         """
 		Pull out the event count for the template strand
 		"""
+        if not self.is_open:
+            return 0
+        # the shape is in the dataset's metadata; no need to read the table
         try:
-            table = self.hdf5file[fastq_paths[self.version]['template'] %
-                                  self.group]
-            return len(table['Events'][()])
-        except Exception as e:
+            return self.hdf5file[self._paths['template']]['Events'].shape[0]
+        except (KeyError, IndexError):
             return 0
 
     def get_complement_events_count(self):
         """
 		Pull out the event count for the complementary strand
 		"""
+        if not self.is_open:
+            return 0
+        # the shape is in the dataset's metadata; no need to read the table
         try:
-            table = self.hdf5file[fastq_paths[self.version]['complement'] %
-                                  self.group]
-            return len(table['Events'][()])
-        except Exception as e:
+            return self.hdf5file[self._paths['complement']]['Events'].shape[0]
+        except (KeyError, IndexError):
             return 0
 
     def is_high_quality(self):
@@ -879,75 +955,170 @@ Please report this error (with the offending file) to:
     # Private API methods
     ####################################################################
 
-    def _extract_fastqs_from_fast5(self):
+    def _extract_sequences(self, want_fastq=True, want_fasta=True):
         """
-		Return the sequence in the FAST5 file in FASTQ format
+		Pull the base called sequences out of the FAST5 file, reading
+		each FASTQ dataset once and building the requested FASTQ
+		and/or FASTA records from it.
 		"""
-        for id, h5path in list(fastq_paths[self.version].items()):
+        for id, h5path in self._paths.items():
+            if id not in self._raw_fastq:
+                try:
+                    self._raw_fastq[id] = extract_fastq(self.hdf5file[h5path])
+                except Exception as e:
+                    logger.warning(
+                        f"Could not extract sequence from {self.filename}: {e}")
+                    self._raw_fastq[id] = None
+
+            table = self._raw_fastq[id]
+            if not table:
+                continue
             try:
-                table = extract_data(self.hdf5file[h5path.format(self.group)])
-                if not table:
-                    continue
-                fq = formats.Fastq(table)
-                fq.name += " " + self.filename
-                self.fastqs[id] = fq
+                if want_fastq and id not in self.fastqs:
+                    fq = formats.Fastq(table)
+                    fq.name += " " + self.filename
+                    self.fastqs[id] = fq
+                if want_fasta and id not in self.fastas:
+                    fa = formats.Fasta(table)
+                    fa.name += " " + self.filename
+                    self.fastas[id] = fa
             except Exception as e:
                 logger.warning(
-                    f"Could not extract FASTQ from {self.filename}: {e}")
-                pass
-
-    def _extract_fastas_from_fast5(self):
-        """
-		Return the sequence in the FAST5 file in FASTA format
-		"""
-        for id, h5path in list(fastq_paths[self.version].items()):
-            try:
-                table = extract_data(self.hdf5file[h5path % self.group])
-                if not table:
-                    continue
-                fa = formats.Fasta(table)
-                fa.name += " " + self.filename
-                self.fastas[id] = fa
-            except Exception as e:
-                logger.warning(
-                    f"Could not extract FASTA from {self.filename}: {e}")
-                pass
+                    f"Could not parse sequence from {self.filename}: {e}")
 
     def _extract_template_events(self):
         """
 		Pull out the event information for the template strand
 		"""
         try:
-            table = self.hdf5file[fastq_paths[self.version]['template'] %
-                                  self.group]
-            self.template_events = [Event(x) for x in table['Events'][()]]
+            table = self.hdf5file[self._paths['template']]
+            self.template_events = EventArray(_read_events(table['Events']))
         except Exception as e:
-            self.template_events = []
+            self.template_events = EventArray.empty()
 
     def _extract_complement_events(self):
         """
 		Pull out the event information for the complementary strand
 		"""
         try:
-            table = self.hdf5file[fastq_paths[self.version]['complement'] %
-                                  self.group]
-            self.complement_events = [Event(x) for x in table['Events'][()]]
+            table = self.hdf5file[self._paths['complement']]
+            self.complement_events = EventArray(_read_events(table['Events']))
         except Exception as e:
-            self.complement_events = []
+            self.complement_events = EventArray.empty()
 
     def _extract_pre_basecalled_events(self):
         """
 		Pull out the pre-basecalled event information
 		"""
         # try:
-        table = self.hdf5file[fastq_paths[self.version]['pre_basecalled']]
-        events = []
-        for read in table:
-            events.extend(table[read]["Events"][()])
-        self.pre_basecalled_events = [Event(x) for x in events]
+        table = self.hdf5file[self._paths['pre_basecalled']]
+        events = [_read_events(table[read]["Events"]) for read in table]
+        if events:
+            self.pre_basecalled_events = EventArray(np.concatenate(events))
+        else:
+            self.pre_basecalled_events = EventArray.empty()
         # except Exception, e:
         # self.pre_basecalled_events = []
 
+    @cached_property
+    def _summary(self):
+        return Fast5Summary(**self._metadata, **self._timing)
+
+    @cached_property
+    def _metadata(self):
+        # flowcell metadata only; never touches the read or timing nodes
+        if self.have_metadata is False:
+            self._get_metadata()
+            self.have_metadata = True
+
+        tracking_id = self._attrs['tracking_id']
+        context_tags = self._attrs['context_tags']
+
+        channel = None
+        for name in ('channel_id', 'read_id'):
+            try:
+                channel = int(self._attrs[name]['channel_number'])
+                break
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        try:
+            exp_start_time = _parse_exp_start_time(
+                tracking_id.get('exp_start_time'))
+        except (ValueError, AttributeError) as e:
+            logger.warning("%s: cannot parse exp_start_time: %s"
+                           % (self.filename, e))
+            exp_start_time = None
+
+        try:
+            sample_frequency = int(context_tags['sample_frequency'])
+        except (KeyError, TypeError, ValueError):
+            sample_frequency = None
+
+        return dict(
+            filename=self.filename,
+            channel=channel,
+            exp_start_time=exp_start_time,
+            sample_frequency=sample_frequency,
+            run_id=tracking_id.get('run_id'),
+            flowcell_id=tracking_id.get('flowcell_id',
+                                        tracking_id.get('flow_cell_id')),
+            asic_id=tracking_id.get('asic_id'),
+            asic_temp=tracking_id.get('asic_temp'),
+            heatsink_temp=tracking_id.get('heatsink_temp'),
+            device_id=tracking_id.get('device_id'),
+            host_name=tracking_id.get('hostname'),
+            run_purpose=tracking_id.get('exp_script_purpose'),
+            script_name=tracking_id.get('exp_script_name'),
+            sample_name=context_tags.get('user_filename_input'),
+            version_name=context_tags.get('version_name'),
+            minknow_version=context_tags.get('verssion'))
+
+    @cached_property
+    def _timing(self):
+        exp_start_time = self._metadata['exp_start_time']
+        sample_frequency = self._metadata['sample_frequency']
+
+        # poretools reports times in seconds, not samples
+        start_time = None
+        duration = None
+
+        # new raw files
+        node = self._raw_read_node
+        if node:
+            try:
+                start_time = int(exp_start_time) + int(
+                    node.attrs['start_time'] / sample_frequency)
+            except Exception as e:
+                logger.error(str(e))
+            try:
+                duration = int(node.attrs['duration']) / sample_frequency
+            except Exception as e:
+                logger.error(str(e))
+
+        node = self._event_timing_node
+        if node:
+            if start_time is None and exp_start_time is not None:
+                start_time = int(exp_start_time) + int(
+                    node.attrs['start_time'])
+            if duration is None:
+                #NOTE: 'duration' in the HDF is a float-point number,
+                #      and can be less than one - which will return 0.
+                #TODO: consider supporing floating-point, or at least
+                #      rounding values instead of truncating to int.
+                duration = int(node.attrs['duration'])
+
+        # 'duration' can be zero and still valid
+        # (if the duration of the template was less than 1 second).
+        # Check for None instead of False.
+        if start_time and (duration is not None):
+            end_time = start_time + duration
+        else:
+            end_time = None
+
+        return dict(start_time=start_time, duration=duration,
+                    end_time=end_time)
+
     def _get_metadata(self):
         try:
             self.keyinfo = self.hdf5file['/UniqueGlobalKey']
@@ -958,11 +1129,106 @@ Please report this error (with the offending file) to:
                 self.keyinfo = None
                 logger.warning("Cannot find keyinfo. Exiting.\n")
 
+        # snapshot the attributes of each metadata group once so that the
+        # accessors below are plain dict lookups rather than HDF5 reads.
+        self._attrs = {}
+        for name in METADATA_GROUPS:
+            if self.keyinfo is not None and name in self.keyinfo:
+                self._attrs[name] = _decode_attrs(self.keyinfo[name].attrs)
+            else:
+                self._attrs[name] = {}
 
-def extract_data(s):
-    if isinstance(s, h5py.Group):
-        return extract_data(s["Fastq"])
-    elif isinstance(s, h5py.Dataset):
-        return s.asstr()[()]  # type: ignore
-    else:
+
+def _parse_exp_start_time(exp_start_time):
+    if exp_start_time is None:
         return None
+    if exp_start_time.endswith('Z'):
+        # MinKNOW >= 1.4 ISO format and UTC time
+        dt = datetime.datetime.fromisoformat(exp_start_time[:-1] + '+00:00')
+        return int(dt.timestamp())
+    # Unix time stamp from MinKNOW < 1.4
+    return int(exp_start_time)
+
+
+def _decode_attrs(attrs):
+    """
+	Copy an h5py AttributeManager into a plain dict, decoding
+	byte strings to str.
+	"""
+    d = {}
+    for key, value in attrs.items():
+        if isinstance(value, bytes):
+            value = value.decode('utf-8', 'replace')
+        d[key] = value
+    return d
+
+
+def _readahead(filename):
+    """
+	Hint the kernel to pull filename into the page cache
+	(POSIX_FADV_WILLNEED) ahead of h5py opening it.
+	"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(filename, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _scan_fast5(root):
+    """
+	Recursively yield the paths of the FAST5 files below root,
+	in the same top-down order as os.walk.
+	"""
+    subdirs = []
+    try:
+        it = os.scandir(root)
+    except OSError as e:
+        # like os.walk, skip directories that cannot be listed
+        logger.warning("Cannot list directory %s: %s" % (root, e))
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.endswith('.fast5'):
+                yield entry.path
+    for subdir in subdirs:
+        yield from _scan_fast5(subdir)
+
+
+def _read_events(ds):
+    """
+	Read an Events dataset into a freshly allocated structured array
+	with Dataset.read_direct, bypassing h5py's slicing machinery.
+	"""
+    arr = np.empty(ds.shape, dtype=ds.dtype)
+    if arr.size:
+        ds.read_direct(arr)
+    return arr
+
+
+def extract_fastq(node):
+    """
+	Return the FASTQ text held by node: either a basecall group
+	containing a 'Fastq' dataset, or that dataset itself. Reads
+	through the low-level dataset API, which skips the per-call
+	wrapper objects of Dataset.asstr()[()].
+	"""
+    if isinstance(node, h5py.Group):
+        dsid = h5d.open(node.id, b'Fastq')
+    else:
+        dsid = node.id
+    buf = np.empty(dsid.shape, dtype=dsid.dtype)
+    dsid.read(h5s.ALL, h5s.ALL, buf)
+    fastq = buf[()]
+    if isinstance(fastq, bytes):
+        fastq = fastq.decode('utf-8')
+    return fastq
@@ -25,20 +25,21 @@ def run(parser, args):
     for fast5 in Fast5FileSet(args.files):
 
         # run and flowcell parameters
-        asic_temp = fast5.get_asic_temp()
-        asic_id = fast5.get_asic_id()
-        heatsink_temp = fast5.get_heatsink_temp()
-        channel_number = fast5.get_channel_number()
+        summary = fast5.summary()
+        asic_temp = summary.asic_temp
+        asic_id = summary.asic_id
+        heatsink_temp = summary.heatsink_temp
+        channel_number = summary.channel
 
         # try and get timing info
         try:
-            start_time = fast5.get_start_time()
+            start_time = summary.start_time
             start_time_string = datetime.datetime.fromtimestamp(
                 float(start_time)).strftime("%Y-%b-%d (%a)\t%H:%M:%S")
-            exp_start_time = fast5.get_exp_start_time()
+            exp_start_time = summary.exp_start_time
             exp_start_time_string = datetime.datetime.fromtimestamp(
                 float(exp_start_time)).strftime("%Y-%b-%d (%a)\t%H:%M:%S")
-            duration = fast5.get_duration()
+            duration = summary.duration
         except KeyError:
             start_time = "Not found"
             start_time_string = "NA\tNA"
@@ -66,20 +66,21 @@ def run(parser, args):
         if fast5.is_open:
             fq = fast5.get_fastq()
 
-            start_time = fast5.get_start_time()
+            summary = fast5.summary()
+            start_time = summary.start_time
             if start_time is None:
                 logger.warning("No start time for %s!" % (fast5.filename))
                 fast5.close()
                 continue
 
-            pore_id = fast5.get_channel_number()
+            pore_id = summary.channel
             tot_reads_per_pore[int(pore_id)] += 1
             tot_bp_per_pore[int(pore_id)] += len(fq.seq)
 
             print(("\t".join(
                 [str(pore_id),
                  str(start_time),
-                 str(fast5.get_duration())])))
+                 str(summary.duration)])))
             fast5.close()
 
     if args.plot_type == 'read_count':
@@ -20,7 +20,8 @@ def run(parser, args):
 
             fq = fast5.get_fastq()
 
-            start_time = fast5.get_start_time()
+            summary = fast5.summary()
+            start_time = summary.start_time
             if start_time is None:
                 logger.warning("No start time for %s!" % (fast5.filename))
                 fast5.close()
@@ -32,13 +33,13 @@ def run(parser, args):
                 read_length = 0
 
             lt = localtime(start_time)
-            print(("\t".join([str(fast5.get_channel_number()),
+            print(("\t".join([str(summary.channel),
              fast5.filename,
              str(read_length),
-             str(fast5.get_exp_start_time()),
+             str(summary.exp_start_time),
              str(start_time), \
-             str(fast5.get_duration()),
-             str(fast5.get_end_time()),
+             str(summary.duration),
+             str(summary.end_time),
              strftime('%Y-%m-%dT%H:%M:%S%z', lt),
              strftime('%d', lt),
              strftime('%H', lt),